@@ -1,5 +1,5 @@
 from .config import *
-from .llm_clients import LLMClients as llm_client
+from .llm_clients import LLMClients as llm_client, model_settings
 
 
-__all__ = ['llm_client']
+__all__ = ['llm_client', 'model_settings']
@@ -1,16 +1,41 @@
 from __future__ import annotations
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+import functools
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+
+@functools.lru_cache(maxsize=None)
+def _get_chat_model(model: str, temperature: float) -> ChatGoogleGenerativeAI:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(model=model, temperature=temperature)
+
+
+class _LazyChatModel:
+    def __init__(self, model: str, temperature: float = 0) -> None:
+        self.model = model
+        self.temperature = temperature
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> ChatGoogleGenerativeAI:
+        return _get_chat_model(self.model, float(self.temperature))
 
 
 class LLMClients:
     # models for creating repo
-    FEATURE_EXTRACTOR_MODEL = ChatGoogleGenerativeAI(model="gemini-3-pro-preview", temperature=0)
-    FLOW_EXTRACTOR_MODEL = ChatGoogleGenerativeAI(model="gemini-3-pro-preview", temperature=0)
-    SCREEN_EXTRACTOR_MODEL = ChatGoogleGenerativeAI(model="gemini-3-pro-preview", temperature=0)
-    INTERACTION_EXTRACTOR_MODEL = ChatGoogleGenerativeAI(
+    FEATURE_EXTRACTOR_MODEL = _LazyChatModel(model="gemini-3-pro-preview", temperature=0)
+    FLOW_EXTRACTOR_MODEL = _LazyChatModel(model="gemini-3-pro-preview", temperature=0)
+    SCREEN_EXTRACTOR_MODEL = _LazyChatModel(model="gemini-3-pro-preview", temperature=0)
+    INTERACTION_EXTRACTOR_MODEL = _LazyChatModel(
         model="gemini-3-pro-preview", temperature=0)
 
     # models for quering
-    QUERY_PLANNER_MODEL = ChatGoogleGenerativeAI(model="gemini-3-pro-preview", temperature=0)
-    QUERY_SEARCH_MODEL = ChatGoogleGenerativeAI(model="gemini-3-pro-preview", temperature=0)
+    QUERY_PLANNER_MODEL = _LazyChatModel(model="gemini-3-pro-preview", temperature=0)
+    QUERY_SEARCH_MODEL = _LazyChatModel(model="gemini-3-pro-preview", temperature=0)
+
+
+def model_settings(name: str) -> str:
+    model: _LazyChatModel = LLMClients.__dict__[name]
+    return f"{model.model}:{float(model.temperature)}"
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+InputsT = TypeVar("InputsT", bound=BaseModel)
 
 
 class PipelineContext(BaseModel):
@@ -14,6 +18,14 @@ class PipelineContext(BaseModel):
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    _parsed_inputs: dict[type[BaseModel], BaseModel] = PrivateAttr(default_factory=dict)
+
+    def parse_inputs(self, schema: type[InputsT]) -> InputsT:
+        parsed = self._parsed_inputs.get(schema)
+        if parsed is None:
+            parsed = self._parsed_inputs[schema] = schema.model_validate(self.inputs)
+        return parsed  # type: ignore[return-value]
+
     def set_artifact(self, key: str, value: Any) -> None:
         self.artifacts[key] = value
 
@@ -21,21 +33,21 @@ class PipelineContext(BaseModel):
         return self.artifacts.get(key)
 
     def to_jsonable(self) -> dict[str, Any]:
+        cache: dict[int, Any] = {}
         return {
-            "inputs": _to_jsonable(self.inputs),
-            "artifacts": _to_jsonable(self.artifacts),
-            "metadata": _to_jsonable(self.metadata),
+            "inputs": _to_jsonable(self.inputs, cache),
+            "artifacts": _to_jsonable(self.artifacts, cache),
+            "metadata": _to_jsonable(self.metadata, cache),
         }
 
 
 logger = logging.getLogger(__name__)
 
 
-class Node(BaseModel):
+@dataclass(slots=True)
+class Node:
     name: str
-    depends_on: list[str] = Field(default_factory=list)
-
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    depends_on: list[str] = field(default_factory=list)
 
     def log_start(self, context: PipelineContext) -> None:
         logger.info("Starting node: %s", self.name)
@@ -53,8 +65,9 @@ class Node(BaseModel):
         return await asyncio.to_thread(self.run, context)
 
 
+@dataclass(slots=True)
 class ConditionalNode(Node):
-    route_map: dict[str, str] = Field(default_factory=dict)
+    route_map: dict[str, str] = field(default_factory=dict)
 
     def route(self, context: PipelineContext) -> str:
         raise NotImplementedError
@@ -64,11 +77,27 @@ class PipelineError(RuntimeError):
     pass
 
 
-def _to_jsonable(value: Any) -> Any:
-    if isinstance(value, BaseModel):
-        return value.model_dump()
-    if isinstance(value, dict):
-        return {key: _to_jsonable(val) for key, val in value.items()}
-    if isinstance(value, list):
-        return [_to_jsonable(item) for item in value]
+@functools.singledispatch
+def _to_jsonable(value: Any, _cache: dict[int, Any] | None = None) -> Any:
     return value
+
+
+@_to_jsonable.register(BaseModel)
+def _model_to_jsonable(value: BaseModel, _cache: dict[int, Any] | None = None) -> Any:
+    if _cache is None:
+        return value.model_dump()
+    key = id(value)
+    dumped = _cache.get(key)
+    if dumped is None:
+        dumped = _cache[key] = value.model_dump()
+    return dumped
+
+
+@_to_jsonable.register(dict)
+def _dict_to_jsonable(value: dict, _cache: dict[int, Any] | None = None) -> Any:
+    return {key: _to_jsonable(val, _cache) for key, val in value.items()}
+
+
+@_to_jsonable.register(list)
+def _list_to_jsonable(value: list, _cache: dict[int, Any] | None = None) -> Any:
+    return [_to_jsonable(item, _cache) for item in value]
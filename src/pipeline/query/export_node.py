@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-import json
-from datetime import datetime, timezone
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from src.pipeline.base import Node, PipelineContext, _to_jsonable
 from src.pipeline.query.query_planner import QueryPlan
+from src.utils.json_io import write_json
 
 DEFAULT_EXPORT_DIR = Path("data/json/exports")
 
@@ -17,53 +18,61 @@ class QueryExportInputs(BaseModel):
     output_dir: str | None = None
 
 
+@dataclass(slots=True)
 class QueryExportNode(Node):
     name: str = "query_export"
-    depends_on: list[str] = [
-        "similar_feature_search",
-        "similar_flow_search",
-        "similar_screen_search",
-        "similar_interaction_search",
-    ]
-    output_dir: Path = Field(default_factory=lambda: DEFAULT_EXPORT_DIR)
+    depends_on: list[str] = field(
+        default_factory=lambda: [
+            "similar_feature_search",
+            "similar_flow_search",
+            "similar_screen_search",
+            "similar_interaction_search",
+        ]
+    )
+    output_dir: Path = field(default_factory=lambda: DEFAULT_EXPORT_DIR)
 
     def run(self, context: PipelineContext) -> dict[str, Any]:
-        inputs = QueryExportInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(QueryExportInputs)
         output_dir = Path(inputs.output_dir) if inputs.output_dir else self.output_dir
         output_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
         payload = _build_export_payload(context, timestamp)
         filename = f"{payload['pipeline_type']}_{timestamp}.json"
         output_path = output_dir / filename
-        output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        write_json(output_path, payload)
         return {"output_path": str(output_path), "timestamp": timestamp}
 
 
 def _build_export_payload(
     context: PipelineContext, timestamp: str
 ) -> dict[str, Any]:
-    plan = context.get_artifact("query_plan")
-    plan_payload = _to_jsonable(plan) if isinstance(plan, QueryPlan) else {}
-    search_result = _find_search_result(context)
+    artifacts = context.artifacts
+    inputs = context.inputs
+    cache: dict[int, Any] = {}
+    plan = artifacts.get("query_plan")
+    plan_payload = _to_jsonable(plan, cache) if isinstance(plan, QueryPlan) else {}
+    search_result = _find_search_result(artifacts, cache)
 
     return {
         "pipeline_type": "query",
         "timestamp": timestamp,
-        "query": context.inputs.get("query", ""),
-        "app_name": context.inputs.get("app_name", ""),
+        "query": inputs.get("query", ""),
+        "app_name": inputs.get("app_name", ""),
         "plan": plan_payload,
         "result": search_result,
     }
 
 
-def _find_search_result(context: PipelineContext) -> dict[str, Any]:
+def _find_search_result(
+    artifacts: dict[str, Any], cache: dict[int, Any] | None = None
+) -> dict[str, Any]:
     for name in (
         "similar_feature_search",
         "similar_flow_search",
         "similar_screen_search",
         "similar_interaction_search",
     ):
-        result = context.get_artifact(name)
+        result = artifacts.get(name)
         if isinstance(result, dict):
-            return {"node": name, **_to_jsonable(result)}
+            return {"node": name, **_to_jsonable(result, cache)}
     return {}
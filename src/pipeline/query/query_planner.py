@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import json
+import functools
+from dataclasses import dataclass, field
 from typing import Any
 
 from langchain_core.messages import HumanMessage, SystemMessage
@@ -10,7 +11,7 @@ from pydantic import BaseModel, Field
 
 from src.config import llm_client
 from src.pipeline.base import ConditionalNode, PipelineContext
-from src.pipeline.repository.utils import coerce_str, extract_json
+from src.pipeline.repository.utils import coerce_str, parse_json
 
 SYSTEM_PROMPT = (
     "You are a query planner for a product knowledge repository. "
@@ -19,12 +20,14 @@ SYSTEM_PROMPT = (
     "{format_instructions}"
 )
 
-HUMAN_PROMPT = (
-    "Query: {query}\n"
-    "App name (optional): {app_name}\n"
-    "Return a QueryPlan that sets intent, target_level, depth, constraints, "
-    "filters, and output_schema."
-)
+
+def _format_human(query: str, app_name: str) -> str:
+    return (
+        f"Query: {query}\n"
+        f"App name (optional): {app_name}\n"
+        "Return a QueryPlan that sets intent, target_level, depth, constraints, "
+        "filters, and output_schema."
+    )
 
 
 class QueryPlanFilters(BaseModel):
@@ -63,7 +66,7 @@ class QueryPlanParser(BaseOutputParser[QueryPlan]):
         )
 
     def parse(self, text: str) -> QueryPlan:
-        payload = json.loads(extract_json(text))
+        payload = parse_json(text)
         filters_payload = payload.get("filters") if isinstance(payload, dict) else {}
         filters = _parse_filters(filters_payload)
 
@@ -83,11 +86,17 @@ class QueryPlanParser(BaseOutputParser[QueryPlan]):
         )
 
 
+_PARSER = QueryPlanParser()
+_SYSTEM_TEXT = SYSTEM_PROMPT.format(format_instructions=_PARSER.get_format_instructions())
+
+
 class QueryPlanner:
     def __init__(self) -> None:
-        self.parser = QueryPlanParser()
-        self.model = llm_client.QUERY_PLANNER_MODEL
-        self.chain: RunnableLambda = self._build_chain()
+        self.parser = _PARSER
+
+    @property
+    def chain(self) -> Any:
+        return _build_chain()
 
     def plan(self, query: str, app_name: str | None = None) -> QueryPlan:
         return self.chain.invoke({"query": query, "app_name": app_name or ""})
@@ -95,27 +104,12 @@ class QueryPlanner:
     async def aplan(self, query: str, app_name: str | None = None) -> QueryPlan:
         return await self.chain.ainvoke({"query": query, "app_name": app_name or ""})
 
-    def _build_chain(self) -> Any:
-        def build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
-            system_text = SYSTEM_PROMPT.format(
-                format_instructions=self.parser.get_format_instructions()
-            )
-            human_text = HUMAN_PROMPT.format(
-                query=inputs["query"], app_name=inputs.get("app_name", "")
-            )
-
-            return [
-                SystemMessage(content=system_text),
-                HumanMessage(content=human_text),
-            ]
-
-        return RunnableLambda(build_messages) | self.model | self.parser
-
 
+@dataclass(slots=True)
 class QueryPlanNode(ConditionalNode):
     name: str = "query_plan"
-    depends_on: list[str] = []
-    route_map: dict[str, str] = Field(
+    depends_on: list[str] = field(default_factory=list)
+    route_map: dict[str, str] = field(
         default_factory=lambda: {
             "feature": "similar_feature_search",
             "flow": "similar_flow_search",
@@ -123,14 +117,14 @@ class QueryPlanNode(ConditionalNode):
             "interaction": "similar_interaction_search",
         }
     )
-    planner: QueryPlanner = Field(default_factory=QueryPlanner)
+    planner: QueryPlanner = field(default_factory=QueryPlanner)
 
     def run(self, context: PipelineContext) -> QueryPlan:
-        inputs = QueryPlanInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(QueryPlanInputs)
         return self.planner.plan(inputs.query, inputs.app_name)
 
     async def arun(self, context: PipelineContext) -> QueryPlan:
-        inputs = QueryPlanInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(QueryPlanInputs)
         return await self.planner.aplan(inputs.query, inputs.app_name)
 
     def route(self, context: PipelineContext) -> str:
@@ -140,6 +134,20 @@ class QueryPlanNode(ConditionalNode):
         return "feature"
 
 
+@functools.cache
+def _build_chain() -> Any:
+    return RunnableLambda(_build_messages) | llm_client.QUERY_PLANNER_MODEL | _PARSER
+
+
+def _build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
+    human_text = _format_human(inputs["query"], inputs.get("app_name", ""))
+
+    return [
+        SystemMessage(content=_SYSTEM_TEXT),
+        HumanMessage(content=human_text),
+    ]
+
+
 def _parse_filters(filters_payload: Any) -> QueryPlanFilters:
     if not isinstance(filters_payload, dict):
         return QueryPlanFilters()
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.runnables import RunnableLambda
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from src.config import llm_client
 from src.pipeline.base import ConditionalNode, PipelineContext
@@ -19,9 +22,10 @@ from src.pipeline.query.utils import (
     collect_matches,
     get_query_plan,
     load_repository,
+    prefilter_candidates,
     sanitize_top_k,
 )
-from src.pipeline.repository.utils import coerce_str, extract_json
+from src.pipeline.repository.utils import coerce_str, parse_json
 
 SYSTEM_PROMPT = (
     "You are a retrieval assistant selecting the most relevant repository items. "
@@ -29,14 +33,18 @@ SYSTEM_PROMPT = (
     "{format_instructions}"
 )
 
-HUMAN_PROMPT = (
-    "Query: {query}\n"
-    "Target level: feature\n"
-    "Constraints: {constraints}\n"
-    "Filters: {filters}\n"
-    "Return up to {top_k} keys from the candidates in relevance order.\n"
-    "Candidates:\n{candidates}"
-)
+
+def _format_human(
+    query: str, constraints: str, filters: str, top_k: int, candidates: str
+) -> str:
+    return (
+        f"Query: {query}\n"
+        "Target level: feature\n"
+        f"Constraints: {constraints}\n"
+        f"Filters: {filters}\n"
+        f"Return up to {top_k} keys from the candidates in relevance order.\n"
+        f"Candidates:\n{candidates}"
+    )
 
 
 class SimilarFeatureSearchInputs(BaseModel):
@@ -50,7 +58,7 @@ class SimilarFeatureKeysParser(BaseOutputParser[list[str]]):
         return "Return valid JSON with key 'keys' as a list of candidate keys."
 
     def parse(self, text: str) -> list[str]:
-        payload = json.loads(extract_json(text))
+        payload = parse_json(text)
         if isinstance(payload, list):
             keys = payload
         elif isinstance(payload, dict):
@@ -60,11 +68,17 @@ class SimilarFeatureKeysParser(BaseOutputParser[list[str]]):
         return [coerce_str(key) for key in keys if coerce_str(key)]
 
 
+_PARSER = SimilarFeatureKeysParser()
+_SYSTEM_TEXT = SYSTEM_PROMPT.format(format_instructions=_PARSER.get_format_instructions())
+
+
 class SimilarFeatureSearchEngine:
     def __init__(self) -> None:
-        self.parser = SimilarFeatureKeysParser()
-        self.model = llm_client.QUERY_SEARCH_MODEL
-        self.chain = self._build_chain()
+        self.parser = _PARSER
+
+    @property
+    def chain(self) -> Any:
+        return _build_chain()
 
     def search(
         self,
@@ -98,53 +112,34 @@ class SimilarFeatureSearchEngine:
             }
         )
 
-    def _build_chain(self) -> Any:
-        def build_messages(inputs: dict[str, Any]) -> list[SystemMessage | HumanMessage]:
-            system_text = SYSTEM_PROMPT.format(
-                format_instructions=self.parser.get_format_instructions()
-            )
-            plan = inputs.get("plan")
-            filters = {}
-            constraints: list[str] = []
-            if isinstance(plan, QueryPlan):
-                filters = plan.filters.model_dump()
-                constraints = plan.constraints
-            human_text = HUMAN_PROMPT.format(
-                query=inputs["query"],
-                constraints=json.dumps(constraints, ensure_ascii=True),
-                filters=json.dumps(filters, ensure_ascii=True),
-                top_k=inputs["top_k"],
-                candidates=json.dumps(inputs["candidates"], ensure_ascii=True),
-            )
-            return [SystemMessage(content=system_text), HumanMessage(content=human_text)]
-
-        return RunnableLambda(build_messages) | self.model | self.parser
-
 
+@dataclass(slots=True)
 class SimilarFeatureSearchNode(ConditionalNode):
     name: str = "similar_feature_search"
-    depends_on: list[str] = ["query_plan"]
-    route_map: dict[str, str] = Field(default_factory=lambda: {"export": "query_export"})
-    engine: SimilarFeatureSearchEngine = Field(default_factory=SimilarFeatureSearchEngine)
+    depends_on: list[str] = field(default_factory=lambda: ["query_plan"])
+    route_map: dict[str, str] = field(default_factory=lambda: {"export": "query_export"})
+    engine: SimilarFeatureSearchEngine = field(default_factory=SimilarFeatureSearchEngine)
 
     def run(self, context: PipelineContext) -> dict[str, Any]:
-        inputs = SimilarFeatureSearchInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(SimilarFeatureSearchInputs)
         repository_path = Path(inputs.repository_path) if inputs.repository_path else DEFAULT_REPOSITORY_PATH
         payload = load_repository(repository_path)
         plan = get_query_plan(context)
         candidates, mapping = _build_candidates(payload)
         top_k = sanitize_top_k(inputs.top_k, DEFAULT_TOP_K)
+        candidates = prefilter_candidates(inputs.query, plan, candidates, top_k)
         keys = self.engine.search(inputs.query, plan, candidates, top_k)
         matches = collect_matches(keys, mapping)
         return {"keys": keys, "matches": matches}
 
     async def arun(self, context: PipelineContext) -> dict[str, Any]:
-        inputs = SimilarFeatureSearchInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(SimilarFeatureSearchInputs)
         repository_path = Path(inputs.repository_path) if inputs.repository_path else DEFAULT_REPOSITORY_PATH
-        payload = load_repository(repository_path)
+        payload = await asyncio.to_thread(load_repository, repository_path)
         plan = get_query_plan(context)
         candidates, mapping = _build_candidates(payload)
         top_k = sanitize_top_k(inputs.top_k, DEFAULT_TOP_K)
+        candidates = prefilter_candidates(inputs.query, plan, candidates, top_k)
         keys = await self.engine.asearch(inputs.query, plan, candidates, top_k)
         matches = collect_matches(keys, mapping)
         return {"keys": keys, "matches": matches}
@@ -153,25 +148,50 @@ class SimilarFeatureSearchNode(ConditionalNode):
         return "export"
 
 
+@functools.cache
+def _build_chain() -> Any:
+    return RunnableLambda(_build_messages) | llm_client.QUERY_SEARCH_MODEL | _PARSER
+
+
+def _build_messages(inputs: dict[str, Any]) -> list[SystemMessage | HumanMessage]:
+    plan = inputs.get("plan")
+    filters = {}
+    constraints: list[str] = []
+    if isinstance(plan, QueryPlan):
+        filters = plan.filters.model_dump()
+        constraints = plan.constraints
+    human_text = _format_human(
+        inputs["query"],
+        orjson.dumps(constraints).decode(),
+        orjson.dumps(filters).decode(),
+        inputs["top_k"],
+        orjson.dumps(inputs["candidates"]).decode(),
+    )
+    return [SystemMessage(content=_SYSTEM_TEXT), HumanMessage(content=human_text)]
+
+
 def _build_candidates(
     payload: dict[str, Any]
 ) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
     features = payload.get("features") if isinstance(payload, dict) else []
-    candidates: list[dict[str, Any]] = []
-    mapping: dict[str, dict[str, Any]] = {}
-    if isinstance(features, list):
-        for feature in features:
-            if not isinstance(feature, dict):
-                continue
-            raw_key = coerce_str(feature.get("id") or feature.get("name"))
-            key = build_candidate_key(feature, raw_key)
-            if not key:
-                continue
-            entry = {
-                "key": key,
-                "name": coerce_str(feature.get("name")),
-                "description": coerce_str(feature.get("description")),
-            }
-            candidates.append(entry)
-            mapping[key] = feature
+    if not isinstance(features, list):
+        return [], {}
+    keyed = [
+        (
+            build_candidate_key(feature, coerce_str(feature.get("id") or feature.get("name"))),
+            feature,
+        )
+        for feature in features
+        if isinstance(feature, dict)
+    ]
+    candidates = [
+        {
+            "key": key,
+            "name": coerce_str(feature.get("name")),
+            "description": coerce_str(feature.get("description")),
+        }
+        for key, feature in keyed
+        if key
+    ]
+    mapping = {key: feature for key, feature in keyed if key}
     return candidates, mapping
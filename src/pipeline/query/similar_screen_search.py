@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+import orjson
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.runnables import RunnableLambda
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from src.config import llm_client
 from src.pipeline.base import ConditionalNode, PipelineContext
@@ -20,9 +23,10 @@ from src.pipeline.query.utils import (
     get_query_plan,
     key_from_order_or_name,
     load_repository,
+    prefilter_candidates,
     sanitize_top_k,
 )
-from src.pipeline.repository.utils import coerce_str, extract_json
+from src.pipeline.repository.utils import coerce_str, parse_json
 
 SYSTEM_PROMPT = (
     "You are a retrieval assistant selecting the most relevant repository items. "
@@ -30,14 +34,18 @@ SYSTEM_PROMPT = (
     "{format_instructions}"
 )
 
-HUMAN_PROMPT = (
-    "Query: {query}\n"
-    "Target level: screen\n"
-    "Constraints: {constraints}\n"
-    "Filters: {filters}\n"
-    "Return up to {top_k} keys from the candidates in relevance order.\n"
-    "Candidates:\n{candidates}"
-)
+
+def _format_human(
+    query: str, constraints: str, filters: str, top_k: int, candidates: str
+) -> str:
+    return (
+        f"Query: {query}\n"
+        "Target level: screen\n"
+        f"Constraints: {constraints}\n"
+        f"Filters: {filters}\n"
+        f"Return up to {top_k} keys from the candidates in relevance order.\n"
+        f"Candidates:\n{candidates}"
+    )
 
 
 class SimilarScreenSearchInputs(BaseModel):
@@ -51,7 +59,7 @@ class SimilarScreenKeysParser(BaseOutputParser[list[str]]):
         return "Return valid JSON with key 'keys' as a list of candidate keys."
 
     def parse(self, text: str) -> list[str]:
-        payload = json.loads(extract_json(text))
+        payload = parse_json(text)
         if isinstance(payload, list):
             keys = payload
         elif isinstance(payload, dict):
@@ -61,11 +69,17 @@ class SimilarScreenKeysParser(BaseOutputParser[list[str]]):
         return [coerce_str(key) for key in keys if coerce_str(key)]
 
 
+_PARSER = SimilarScreenKeysParser()
+_SYSTEM_TEXT = SYSTEM_PROMPT.format(format_instructions=_PARSER.get_format_instructions())
+
+
 class SimilarScreenSearchEngine:
     def __init__(self) -> None:
-        self.parser = SimilarScreenKeysParser()
-        self.model = llm_client.QUERY_SEARCH_MODEL
-        self.chain = self._build_chain()
+        self.parser = _PARSER
+
+    @property
+    def chain(self) -> Any:
+        return _build_chain()
 
     def search(
         self,
@@ -99,53 +113,34 @@ class SimilarScreenSearchEngine:
             }
         )
 
-    def _build_chain(self) -> Any:
-        def build_messages(inputs: dict[str, Any]) -> list[SystemMessage | HumanMessage]:
-            system_text = SYSTEM_PROMPT.format(
-                format_instructions=self.parser.get_format_instructions()
-            )
-            plan = inputs.get("plan")
-            filters = {}
-            constraints: list[str] = []
-            if isinstance(plan, QueryPlan):
-                filters = plan.filters.model_dump()
-                constraints = plan.constraints
-            human_text = HUMAN_PROMPT.format(
-                query=inputs["query"],
-                constraints=json.dumps(constraints, ensure_ascii=True),
-                filters=json.dumps(filters, ensure_ascii=True),
-                top_k=inputs["top_k"],
-                candidates=json.dumps(inputs["candidates"], ensure_ascii=True),
-            )
-            return [SystemMessage(content=system_text), HumanMessage(content=human_text)]
-
-        return RunnableLambda(build_messages) | self.model | self.parser
-
 
+@dataclass(slots=True)
 class SimilarScreenSearchNode(ConditionalNode):
     name: str = "similar_screen_search"
-    depends_on: list[str] = ["query_plan"]
-    route_map: dict[str, str] = Field(default_factory=lambda: {"export": "query_export"})
-    engine: SimilarScreenSearchEngine = Field(default_factory=SimilarScreenSearchEngine)
+    depends_on: list[str] = field(default_factory=lambda: ["query_plan"])
+    route_map: dict[str, str] = field(default_factory=lambda: {"export": "query_export"})
+    engine: SimilarScreenSearchEngine = field(default_factory=SimilarScreenSearchEngine)
 
     def run(self, context: PipelineContext) -> dict[str, Any]:
-        inputs = SimilarScreenSearchInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(SimilarScreenSearchInputs)
         repository_path = Path(inputs.repository_path) if inputs.repository_path else DEFAULT_REPOSITORY_PATH
         payload = load_repository(repository_path)
         plan = get_query_plan(context)
         candidates, mapping = _build_candidates(payload)
         top_k = sanitize_top_k(inputs.top_k, DEFAULT_TOP_K)
+        candidates = prefilter_candidates(inputs.query, plan, candidates, top_k)
         keys = self.engine.search(inputs.query, plan, candidates, top_k)
         matches = collect_matches(keys, mapping)
         return {"keys": keys, "matches": matches}
 
     async def arun(self, context: PipelineContext) -> dict[str, Any]:
-        inputs = SimilarScreenSearchInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(SimilarScreenSearchInputs)
         repository_path = Path(inputs.repository_path) if inputs.repository_path else DEFAULT_REPOSITORY_PATH
-        payload = load_repository(repository_path)
+        payload = await asyncio.to_thread(load_repository, repository_path)
         plan = get_query_plan(context)
         candidates, mapping = _build_candidates(payload)
         top_k = sanitize_top_k(inputs.top_k, DEFAULT_TOP_K)
+        candidates = prefilter_candidates(inputs.query, plan, candidates, top_k)
         keys = await self.engine.asearch(inputs.query, plan, candidates, top_k)
         matches = collect_matches(keys, mapping)
         return {"keys": keys, "matches": matches}
@@ -154,26 +149,48 @@ class SimilarScreenSearchNode(ConditionalNode):
         return "export"
 
 
+@functools.cache
+def _build_chain() -> Any:
+    return RunnableLambda(_build_messages) | llm_client.QUERY_SEARCH_MODEL | _PARSER
+
+
+def _build_messages(inputs: dict[str, Any]) -> list[SystemMessage | HumanMessage]:
+    plan = inputs.get("plan")
+    filters = {}
+    constraints: list[str] = []
+    if isinstance(plan, QueryPlan):
+        filters = plan.filters.model_dump()
+        constraints = plan.constraints
+    human_text = _format_human(
+        inputs["query"],
+        orjson.dumps(constraints).decode(),
+        orjson.dumps(filters).decode(),
+        inputs["top_k"],
+        orjson.dumps(inputs["candidates"]).decode(),
+    )
+    return [SystemMessage(content=_SYSTEM_TEXT), HumanMessage(content=human_text)]
+
+
 def _build_candidates(
     payload: dict[str, Any]
 ) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
     screens = payload.get("screens") if isinstance(payload, dict) else []
-    candidates: list[dict[str, Any]] = []
-    mapping: dict[str, dict[str, Any]] = {}
-    if isinstance(screens, list):
-        for screen in screens:
-            if not isinstance(screen, dict):
-                continue
-            raw_key = key_from_order_or_name(screen)
-            key = build_candidate_key(screen, raw_key)
-            if not key:
-                continue
-            entry = {
-                "key": key,
-                "name": coerce_str(screen.get("name")),
-                "description": coerce_str(screen.get("description")),
-                "key_elements": screen.get("key_elements", []),
-            }
-            candidates.append(entry)
-            mapping[key] = screen
+    if not isinstance(screens, list):
+        return [], {}
+    keyed = [
+        (build_candidate_key(screen, key_from_order_or_name(screen)), screen)
+        for screen in screens
+        if isinstance(screen, dict)
+    ]
+    candidates = [
+        {
+            "key": key,
+            "name": coerce_str(screen.get("name")),
+            "description": coerce_str(screen.get("description")),
+            "key_elements": screen.get("key_elements", []),
+        }
+        for key, screen in keyed
+        if key
+    ]
+    mapping = {key: screen for key, screen in keyed if key}
     return candidates, mapping
@@ -1,30 +1,33 @@
 from __future__ import annotations
 
-import json
+import copy
+import functools
+import os
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any
+
+import orjson
 
 from src.pipeline.base import PipelineContext
 from src.pipeline.query.query_planner import QueryPlan
 from src.pipeline.repository.utils import coerce_str
+from src.utils.text_rank import rank_candidates
 
 DEFAULT_REPOSITORY_PATH = Path("data/json/repo")
 DEFAULT_TOP_K = 5
+PREFILTER_FACTOR = 8
+
+_MERGED_SECTIONS = ("features", "clips", "screens", "interactions")
+_HEADER_KEYS = ("source", "app")
+# Query boilerplate that names the request rather than the product.
+_QUERY_STOPWORDS = frozenset({"add", "app", "feature", "features"})
 
 
 def load_repository(path: Path) -> dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"Repository context not found: {path}")
-    if path.is_dir():
-        payloads = []
-        for json_path in sorted(path.glob("*.json")):
-            payload = json.loads(json_path.read_text(encoding="utf-8"))
-            if isinstance(payload, dict):
-                payloads.append((payload, json_path))
-        if not payloads:
-            raise FileNotFoundError(f"No repository JSON files found in: {path}")
-        return _merge_repository_payloads(payloads)
-    return json.loads(path.read_text(encoding="utf-8"))
+    # The parsed payload is cached per process; callers get their own copy.
+    return copy.deepcopy(_load_repository_cached(path.resolve(), _repository_signature(path)))
 
 
 def get_query_plan(context: PipelineContext) -> QueryPlan | None:
@@ -38,15 +41,31 @@ def sanitize_top_k(value: int | None, default_top_k: int = DEFAULT_TOP_K) -> int
     return max(1, min(value, 10))
 
 
+def prefilter_candidates(
+    query: str,
+    plan: QueryPlan | None,
+    candidates: list[dict[str, Any]],
+    top_k: int,
+) -> list[dict[str, Any]]:
+    limit = top_k * PREFILTER_FACTOR
+    if len(candidates) <= limit:
+        return candidates
+    query_parts = [query]
+    if plan is not None:
+        filters = plan.filters
+        query_parts += (
+            filters.feature_name_hint,
+            filters.flow_name_hint,
+            filters.screen_name_hint,
+            *filters.must_include,
+        )
+    return rank_candidates(" ".join(query_parts), candidates, limit, _QUERY_STOPWORDS)
+
+
 def collect_matches(
     keys: list[str], mapping: dict[str, dict[str, Any]]
 ) -> list[dict[str, Any]]:
-    matches: list[dict[str, Any]] = []
-    for key in keys:
-        item = mapping.get(coerce_str(key))
-        if item is not None:
-            matches.append(item)
-    return matches
+    return [mapping[key] for key in map(coerce_str, keys) if key in mapping]
 
 
 def key_from_order_or_name(item: dict[str, Any]) -> str:
@@ -76,26 +95,50 @@ def build_candidate_key(item: dict[str, Any], base_key: str) -> str:
     return base_key or source_file
 
 
+def _repository_signature(path: Path) -> tuple[tuple[str, int], ...]:
+    if path.is_dir():
+        return tuple((entry.name, entry.stat().st_mtime_ns) for entry in _scan_json_files(path))
+    return ((path.name, path.stat().st_mtime_ns),)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_repository_cached(
+    path: Path, signature: tuple[tuple[str, int], ...]
+) -> dict[str, Any]:
+    if path.is_dir():
+        payloads = []
+        for entry in _scan_json_files(path):
+            with open(entry.path, "rb") as handle:
+                payload = orjson.loads(handle.read())
+            if isinstance(payload, dict):
+                payloads.append((payload, entry.name[: -len(".json")]))
+        if not payloads:
+            raise FileNotFoundError(f"No repository JSON files found in: {path}")
+        return _merge_repository_payloads(payloads)
+    return orjson.loads(path.read_bytes())
+
+
+def _scan_json_files(path: Path) -> list[os.DirEntry[str]]:
+    with os.scandir(path) as entries:
+        json_entries = [
+            entry for entry in entries if entry.name.endswith(".json") and entry.is_file()
+        ]
+    json_entries.sort(key=lambda entry: entry.name)
+    return json_entries
+
+
 def _merge_repository_payloads(
-    payloads: Iterable[tuple[dict[str, Any], Path]]
+    payloads: list[tuple[dict[str, Any], str]]
 ) -> dict[str, Any]:
-    combined: dict[str, Any] = {
-        "features": [],
-        "clips": [],
-        "screens": [],
-        "interactions": [],
-        "flows": [],
-    }
-    for payload, source_path in payloads:
-        source_id = source_path.stem
-        if "source" in payload and "source" not in combined:
-            combined["source"] = payload.get("source")
-        if "app" in payload and "app" not in combined:
-            combined["app"] = payload.get("app")
-        _extend_with_source(combined["features"], payload.get("features"), source_id)
-        _extend_with_source(combined["clips"], payload.get("clips"), source_id)
-        _extend_with_source(combined["screens"], payload.get("screens"), source_id)
-        _extend_with_source(combined["interactions"], payload.get("interactions"), source_id)
+    combined: dict[str, Any] = {section: [] for section in _MERGED_SECTIONS}
+    combined["flows"] = []
+    for key in _HEADER_KEYS:
+        header = next((payload for payload, _ in payloads if key in payload), None)
+        if header is not None:
+            combined[key] = header[key]
+    for payload, source_id in payloads:
+        for section in _MERGED_SECTIONS:
+            _extend_with_source(combined[section], payload.get(section), source_id)
         _extend_flows(combined["flows"], payload, source_id)
 
     if combined["flows"] and "flow" not in combined:
@@ -116,14 +159,10 @@ def _extend_flows(target: list[dict[str, Any]], payload: dict[str, Any], source_
 def _extend_with_source(target: list[dict[str, Any]], items: Any, source_id: str) -> None:
     if not isinstance(items, list):
         return
-    for item in items:
-        if isinstance(item, dict):
-            target.append(_with_source(item, source_id))
+    target.extend(_with_source(item, source_id) for item in items if isinstance(item, dict))
 
 
 def _with_source(item: dict[str, Any], source_id: str) -> dict[str, Any]:
-    if item.get("source_file") == source_id:
-        return item
-    updated = dict(item)
-    updated.setdefault("source_file", source_id)
-    return updated
+    # Payloads are freshly parsed per load, so tagging them in place is safe.
+    item.setdefault("source_file", source_id)
+    return item
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from src.pipeline.base import Node, PipelineContext, _to_jsonable
+from src.utils.json_io import write_json
 
 
 DEFAULT_EXPORT_DIR = Path("data/json/repo")
@@ -16,37 +17,43 @@ class ExportInputs(BaseModel):
     output_path: str | None = None
 
 
+@dataclass(slots=True)
 class ExportNode(Node):
     name: str = "export"
-    depends_on: list[str] = [
-        "screen_extractor",
-        "flow_extractor",
-        "interaction_extractor",
-    ]
+    depends_on: list[str] = field(
+        default_factory=lambda: [
+            "split_video",
+            "screen_extractor",
+            "flow_extractor",
+            "interaction_extractor",
+        ]
+    )
 
     def run(self, context: PipelineContext) -> dict[str, Any]:
-        inputs = ExportInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(ExportInputs)
         output_path = Path(inputs.output_path) if inputs.output_path else _default_output_path(context)
 
         payload = _build_export_payload(context)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        write_json(output_path, payload)
 
         return {"output_path": str(output_path)}
 
 
 def _build_export_payload(context: PipelineContext) -> dict[str, Any]:
-    feature_payload = _to_jsonable(context.get_artifact("feature_extractor"))
-    split_payload = _to_jsonable(context.get_artifact("split_video"))
-    screen_payload = _to_jsonable(context.get_artifact("screen_extractor"))
-    flow_payload = _to_jsonable(context.get_artifact("flow_extractor"))
-    interaction_payload = _to_jsonable(context.get_artifact("interaction_extractor"))
+    artifacts = context.artifacts
+    inputs = context.inputs
+    feature_payload = _dump_artifact(artifacts.get("feature_extractor"))
+    split_payload = _dump_artifact(artifacts.get("split_video"))
+    screen_payload = _dump_artifact(artifacts.get("screen_extractor"))
+    flow_payload = _dump_artifact(artifacts.get("flow_extractor"))
+    interaction_payload = _dump_artifact(artifacts.get("interaction_extractor"))
 
     return {
         "source": {
-            "app_name": context.inputs.get("app_name", ""),
-            "video_path": context.inputs.get("video_path", ""),
-            "metadata": _to_jsonable(context.inputs.get("metadata", {})),
+            "app_name": inputs.get("app_name", ""),
+            "video_path": inputs.get("video_path", ""),
+            "metadata": _to_jsonable(inputs.get("metadata", {})),
         },
         "app": _get_dict(feature_payload, "app"),
         "features": _get_list(feature_payload, "features"),
@@ -57,6 +64,12 @@ def _build_export_payload(context: PipelineContext) -> dict[str, Any]:
     }
 
 
+def _dump_artifact(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return _to_jsonable(value)
+
+
 def _default_output_path(context: PipelineContext) -> Path:
     video_path = context.inputs.get("video_path", "")
     if video_path:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import json
+import functools
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -9,10 +10,17 @@ from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.runnables import RunnableLambda
 from pydantic import BaseModel, Field
 
-from src.config import llm_client
+from src.config import llm_client, model_settings
 from src.pipeline.base import Node, PipelineContext
 
-from .utils import coerce_str, extract_json, load_video_base64
+from .utils import (
+    ainvoke_with_cache,
+    coerce_str_fields,
+    invoke_with_cache,
+    load_video_part,
+    parse_json,
+    prompt_cache_key,
+)
 
 SYSTEM_PROMPT = (
     "You are a product analyst extracting structured app information from a demo "
@@ -46,6 +54,10 @@ class ExtractionResult(BaseModel):
     features: list[FeatureInfo] = Field(default_factory=list)
 
 
+_APP_KEYS = ("id", "name", "description")
+_FEATURE_KEYS = ("id", "name", "description", "start_timestamp", "end_timestamp")
+
+
 class AppFeaturesParser(BaseOutputParser[ExtractionResult]):
     def get_format_instructions(self) -> str:
         return (
@@ -56,83 +68,75 @@ class AppFeaturesParser(BaseOutputParser[ExtractionResult]):
         )
 
     def parse(self, text: str) -> ExtractionResult:
-        payload = json.loads(extract_json(text))
+        payload = parse_json(text)
         app_payload = payload.get("app") or {}
-        app = AppInfo(
-            id=coerce_str(app_payload.get("id")),
-            name=coerce_str(app_payload.get("name")),
-            description=coerce_str(app_payload.get("description")),
-        )
+        app = AppInfo.model_construct(**coerce_str_fields(app_payload, _APP_KEYS))
 
         features_payload = payload.get("features") or []
         features: list[FeatureInfo] = []
         if isinstance(features_payload, list):
-            for item in features_payload:
-                if isinstance(item, dict):
-                    features.append(
-                        FeatureInfo(
-                            id=coerce_str(item.get("id")),
-                            name=coerce_str(item.get("name")),
-                            description=coerce_str(item.get("description")),
-                            start_timestamp=coerce_str(item.get("start_timestamp")),
-                            end_timestamp=coerce_str(item.get("end_timestamp")),
-                        )
-                    )
+            features = [
+                FeatureInfo.model_construct(**coerce_str_fields(item, _FEATURE_KEYS))
+                for item in features_payload
+                if isinstance(item, dict)
+            ]
+
+        return ExtractionResult.model_construct(app=app, features=features)
 
-        return ExtractionResult(app=app, features=features)
+
+_PARSER = AppFeaturesParser()
+_SYSTEM_TEXT = SYSTEM_PROMPT.format(format_instructions=_PARSER.get_format_instructions())
+_HUMAN_TEXT_PART = {"type": "text", "text": HUMAN_PROMPT}
+_CACHE_KEY = prompt_cache_key(
+    model_settings("FEATURE_EXTRACTOR_MODEL"), _SYSTEM_TEXT, HUMAN_PROMPT
+)
+_CACHE_NAMESPACE = "features"
 
 
 class FeatureExtractor:
     def __init__(self) -> None:
-        self.parser = AppFeaturesParser()
-        self.model = llm_client.FEATURE_EXTRACTOR_MODEL
-        self.chain = self._build_chain()
+        self.parser = _PARSER
+
+    @property
+    def chain(self) -> Any:
+        return _build_chain()
 
     def extract(self, video_path: str | Path) -> ExtractionResult:
-        return self.chain.invoke({"video_path": str(video_path)})
+        return invoke_with_cache(
+            self.chain, video_path, _CACHE_NAMESPACE, _CACHE_KEY, ExtractionResult
+        )
 
     async def aextract(self, video_path: str | Path) -> ExtractionResult:
-        return await self.chain.ainvoke({"video_path": str(video_path)})
-
-    def _build_chain(self) -> Any:
-        def build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
-            video_path = inputs["video_path"]
-            mime_type, video_base64 = load_video_base64(video_path)
-            system_text = SYSTEM_PROMPT.format(
-                format_instructions=self.parser.get_format_instructions()
-            )
-
-            return [
-                SystemMessage(content=system_text),
-                HumanMessage(
-                    content=[
-                        {"type": "text", "text": HUMAN_PROMPT},
-                        {
-                            "type": "file",
-                            "source_type": "base64",
-                            "mime_type": mime_type,
-                            "data": video_base64,
-                        },
-                    ]
-                ),
-            ]
-
-        return RunnableLambda(build_messages) | self.model | self.parser
+        return await ainvoke_with_cache(
+            self.chain, video_path, _CACHE_NAMESPACE, _CACHE_KEY, ExtractionResult
+        )
 
 
 class FeatureExtractorInputs(BaseModel):
     video_path: str
 
 
+@dataclass(slots=True)
 class FeatureExtractorNode(Node):
     name: str = "feature_extractor"
-    depends_on: list[str] = []
-    extractor: FeatureExtractor = Field(default_factory=FeatureExtractor)
+    depends_on: list[str] = field(default_factory=list)
+    extractor: FeatureExtractor = field(default_factory=FeatureExtractor)
 
     def run(self, context: PipelineContext) -> ExtractionResult:
-        inputs = FeatureExtractorInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(FeatureExtractorInputs)
         return self.extractor.extract(inputs.video_path)
 
     async def arun(self, context: PipelineContext) -> ExtractionResult:
-        inputs = FeatureExtractorInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(FeatureExtractorInputs)
         return await self.extractor.aextract(inputs.video_path)
+
+
+@functools.cache
+def _build_chain() -> Any:
+    def build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
+        return [
+            SystemMessage(content=_SYSTEM_TEXT),
+            HumanMessage(content=[_HUMAN_TEXT_PART, load_video_part(inputs["video_path"])]),
+        ]
+
+    return RunnableLambda(build_messages) | llm_client.FEATURE_EXTRACTOR_MODEL | _PARSER
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import json
+import functools
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -9,10 +10,19 @@ from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.runnables import RunnableLambda
 from pydantic import BaseModel, Field
 
-from src.config import llm_client
+from src.config import llm_client, model_settings
 from src.pipeline.base import Node, PipelineContext
 
-from .utils import coerce_str, extract_json, load_video_base64
+from .utils import (
+    ainvoke_with_cache,
+    coerce_int,
+    coerce_str,
+    coerce_str_fields,
+    invoke_with_cache,
+    load_video_part,
+    parse_json,
+    prompt_cache_key,
+)
 
 SYSTEM_PROMPT = (
     "You are a UX analyst extracting a detailed user flow from a demo "
@@ -45,6 +55,17 @@ class FlowExtractionResult(BaseModel):
     steps: list[FlowStep] = Field(default_factory=list)
 
 
+_STEP_KEYS = (
+    "title",
+    "description",
+    "user_action",
+    "ui_context",
+    "system_response",
+    "start_timestamp",
+    "end_timestamp",
+)
+
+
 class FlowParser(BaseOutputParser[FlowExtractionResult]):
     def get_format_instructions(self) -> str:
         return (
@@ -54,93 +75,80 @@ class FlowParser(BaseOutputParser[FlowExtractionResult]):
         )
 
     def parse(self, text: str) -> FlowExtractionResult:
-        payload = json.loads(extract_json(text))
+        payload = parse_json(text)
         flow_title = coerce_str(payload.get("flow_title"))
         flow_goal = coerce_str(payload.get("flow_goal"))
 
         steps_payload = payload.get("steps") or []
         steps: list[FlowStep] = []
         if isinstance(steps_payload, list):
-            for index, item in enumerate(steps_payload):
-                if not isinstance(item, dict):
-                    continue
-                steps.append(
-                    FlowStep(
-                        step_number=_coerce_int(item.get("step_number"), index + 1),
-                        title=coerce_str(item.get("title")),
-                        description=coerce_str(item.get("description")),
-                        user_action=coerce_str(item.get("user_action")),
-                        ui_context=coerce_str(item.get("ui_context")),
-                        system_response=coerce_str(item.get("system_response")),
-                        start_timestamp=coerce_str(item.get("start_timestamp")),
-                        end_timestamp=coerce_str(item.get("end_timestamp")),
-                    )
+            steps = [
+                FlowStep.model_construct(
+                    step_number=coerce_int(item.get("step_number"), index + 1),
+                    **coerce_str_fields(item, _STEP_KEYS),
                 )
+                for index, item in enumerate(steps_payload)
+                if isinstance(item, dict)
+            ]
+
+        return FlowExtractionResult.model_construct(
+            flow_title=flow_title, flow_goal=flow_goal, steps=steps
+        )
 
-        return FlowExtractionResult(flow_title=flow_title, flow_goal=flow_goal, steps=steps)
+
+_PARSER = FlowParser()
+_SYSTEM_TEXT = SYSTEM_PROMPT.format(format_instructions=_PARSER.get_format_instructions())
+_HUMAN_TEXT_PART = {"type": "text", "text": HUMAN_PROMPT}
+_CACHE_KEY = prompt_cache_key(
+    model_settings("FLOW_EXTRACTOR_MODEL"), _SYSTEM_TEXT, HUMAN_PROMPT
+)
+_CACHE_NAMESPACE = "flows"
 
 
 class FlowExtractor:
     def __init__(self) -> None:
-        self.parser = FlowParser()
-        self.model = llm_client.FLOW_EXTRACTOR_MODEL
-        self.chain = self._build_chain()
+        self.parser = _PARSER
+
+    @property
+    def chain(self) -> Any:
+        return _build_chain()
 
     def extract(self, video_path: str | Path) -> FlowExtractionResult:
-        return self.chain.invoke({"video_path": str(video_path)})
+        return invoke_with_cache(
+            self.chain, video_path, _CACHE_NAMESPACE, _CACHE_KEY, FlowExtractionResult
+        )
 
     async def aextract(self, video_path: str | Path) -> FlowExtractionResult:
-        return await self.chain.ainvoke({"video_path": str(video_path)})
-
-    def _build_chain(self) -> Any:
-        def build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
-            video_path = inputs["video_path"]
-            mime_type, video_base64 = load_video_base64(video_path)
-            system_text = SYSTEM_PROMPT.format(
-                format_instructions=self.parser.get_format_instructions()
-            )
-
-            return [
-                SystemMessage(content=system_text),
-                HumanMessage(
-                    content=[
-                        {"type": "text", "text": HUMAN_PROMPT},
-                        {
-                            "type": "file",
-                            "source_type": "base64",
-                            "mime_type": mime_type,
-                            "data": video_base64,
-                        },
-                    ]
-                ),
-            ]
-
-        return RunnableLambda(build_messages) | self.model | self.parser
+        return await ainvoke_with_cache(
+            self.chain, video_path, _CACHE_NAMESPACE, _CACHE_KEY, FlowExtractionResult
+        )
 
 
 class FlowExtractorInputs(BaseModel):
     video_path: str
 
 
+@dataclass(slots=True)
 class FlowExtractorNode(Node):
     name: str = "flow_extractor"
-    depends_on: list[str] = ["split_video"]
-    extractor: FlowExtractor = Field(default_factory=FlowExtractor)
+    depends_on: list[str] = field(default_factory=list)
+    extractor: FlowExtractor = field(default_factory=FlowExtractor)
 
     def run(self, context: PipelineContext) -> FlowExtractionResult:
-        inputs = FlowExtractorInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(FlowExtractorInputs)
         return self.extractor.extract(inputs.video_path)
 
     async def arun(self, context: PipelineContext) -> FlowExtractionResult:
-        inputs = FlowExtractorInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(FlowExtractorInputs)
         return await self.extractor.aextract(inputs.video_path)
 
 
-def _coerce_int(value: Any, default: int) -> int:
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str):
-        stripped = value.strip()
-        if stripped.isdigit():
-            return int(stripped)
-    return default
+@functools.cache
+def _build_chain() -> Any:
+    def build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
+        return [
+            SystemMessage(content=_SYSTEM_TEXT),
+            HumanMessage(content=[_HUMAN_TEXT_PART, load_video_part(inputs["video_path"])]),
+        ]
+
+    return RunnableLambda(build_messages) | llm_client.FLOW_EXTRACTOR_MODEL | _PARSER
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import json
+import functools
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -9,10 +10,18 @@ from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.runnables import RunnableLambda
 from pydantic import BaseModel, Field
 
-from src.config import llm_client
+from src.config import llm_client, model_settings
 from src.pipeline.base import Node, PipelineContext
 
-from .utils import coerce_str, extract_json, load_video_base64
+from .utils import (
+    ainvoke_with_cache,
+    coerce_int,
+    coerce_str_fields,
+    invoke_with_cache,
+    load_video_part,
+    parse_json,
+    prompt_cache_key,
+)
 
 SYSTEM_PROMPT = (
     "You are a UX analyst extracting detailed user interactions from a demo "
@@ -46,6 +55,19 @@ class InteractionExtractionResult(BaseModel):
     interactions: list[InteractionInfo] = Field(default_factory=list)
 
 
+_INTERACTION_KEYS = (
+    "name",
+    "interaction_type",
+    "rationale",
+    "description",
+    "user_action",
+    "ui_context",
+    "system_response",
+    "start_timestamp",
+    "end_timestamp",
+)
+
+
 class InteractionParser(BaseOutputParser[InteractionExtractionResult]):
     def get_format_instructions(self) -> str:
         return (
@@ -56,92 +78,75 @@ class InteractionParser(BaseOutputParser[InteractionExtractionResult]):
         )
 
     def parse(self, text: str) -> InteractionExtractionResult:
-        payload = json.loads(extract_json(text))
+        payload = parse_json(text)
         interactions_payload = payload.get("interactions") or []
         interactions: list[InteractionInfo] = []
         if isinstance(interactions_payload, list):
-            for index, item in enumerate(interactions_payload):
-                if not isinstance(item, dict):
-                    continue
-                interactions.append(
-                    InteractionInfo(
-                        order=_coerce_int(item.get("order"), index + 1),
-                        name=coerce_str(item.get("name")),
-                        interaction_type=coerce_str(item.get("interaction_type")),
-                        rationale=coerce_str(item.get("rationale")),
-                        description=coerce_str(item.get("description")),
-                        user_action=coerce_str(item.get("user_action")),
-                        ui_context=coerce_str(item.get("ui_context")),
-                        system_response=coerce_str(item.get("system_response")),
-                        start_timestamp=coerce_str(item.get("start_timestamp")),
-                        end_timestamp=coerce_str(item.get("end_timestamp")),
-                    )
+            interactions = [
+                InteractionInfo.model_construct(
+                    order=coerce_int(item.get("order"), index + 1),
+                    **coerce_str_fields(item, _INTERACTION_KEYS),
                 )
+                for index, item in enumerate(interactions_payload)
+                if isinstance(item, dict)
+            ]
+
+        return InteractionExtractionResult.model_construct(interactions=interactions)
+
 
-        return InteractionExtractionResult(interactions=interactions)
+_PARSER = InteractionParser()
+_SYSTEM_TEXT = SYSTEM_PROMPT.format(format_instructions=_PARSER.get_format_instructions())
+_HUMAN_TEXT_PART = {"type": "text", "text": HUMAN_PROMPT}
+_CACHE_KEY = prompt_cache_key(
+    model_settings("INTERACTION_EXTRACTOR_MODEL"), _SYSTEM_TEXT, HUMAN_PROMPT
+)
+_CACHE_NAMESPACE = "interactions"
 
 
 class InteractionExtractor:
     def __init__(self) -> None:
-        self.parser = InteractionParser()
-        self.model = llm_client.INTERACTION_EXTRACTOR_MODEL
-        self.chain = self._build_chain()
+        self.parser = _PARSER
+
+    @property
+    def chain(self) -> Any:
+        return _build_chain()
 
     def extract(self, video_path: str | Path) -> InteractionExtractionResult:
-        return self.chain.invoke({"video_path": str(video_path)})
+        return invoke_with_cache(
+            self.chain, video_path, _CACHE_NAMESPACE, _CACHE_KEY, InteractionExtractionResult
+        )
 
     async def aextract(self, video_path: str | Path) -> InteractionExtractionResult:
-        return await self.chain.ainvoke({"video_path": str(video_path)})
-
-    def _build_chain(self) -> Any:
-        def build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
-            video_path = inputs["video_path"]
-            mime_type, video_base64 = load_video_base64(video_path)
-            system_text = SYSTEM_PROMPT.format(
-                format_instructions=self.parser.get_format_instructions()
-            )
-
-            return [
-                SystemMessage(content=system_text),
-                HumanMessage(
-                    content=[
-                        {"type": "text", "text": HUMAN_PROMPT},
-                        {
-                            "type": "file",
-                            "source_type": "base64",
-                            "mime_type": mime_type,
-                            "data": video_base64,
-                        },
-                    ]
-                ),
-            ]
-
-        return RunnableLambda(build_messages) | self.model | self.parser
+        return await ainvoke_with_cache(
+            self.chain, video_path, _CACHE_NAMESPACE, _CACHE_KEY, InteractionExtractionResult
+        )
 
 
 class InteractionExtractorInputs(BaseModel):
     video_path: str
 
 
+@dataclass(slots=True)
 class InteractionExtractorNode(Node):
     name: str = "interaction_extractor"
-    depends_on: list[str] = ["split_video"]
-    extractor: InteractionExtractor = Field(default_factory=InteractionExtractor)
+    depends_on: list[str] = field(default_factory=list)
+    extractor: InteractionExtractor = field(default_factory=InteractionExtractor)
 
     def run(self, context: PipelineContext) -> InteractionExtractionResult:
-        inputs = InteractionExtractorInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(InteractionExtractorInputs)
         return self.extractor.extract(inputs.video_path)
 
     async def arun(self, context: PipelineContext) -> InteractionExtractionResult:
-        inputs = InteractionExtractorInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(InteractionExtractorInputs)
         return await self.extractor.aextract(inputs.video_path)
 
 
-def _coerce_int(value: Any, default: int) -> int:
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str):
-        stripped = value.strip()
-        if stripped.isdigit():
-            return int(stripped)
-    return default
+@functools.cache
+def _build_chain() -> Any:
+    def build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
+        return [
+            SystemMessage(content=_SYSTEM_TEXT),
+            HumanMessage(content=[_HUMAN_TEXT_PART, load_video_part(inputs["video_path"])]),
+        ]
+
+    return RunnableLambda(build_messages) | llm_client.INTERACTION_EXTRACTOR_MODEL | _PARSER
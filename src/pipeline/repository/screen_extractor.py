@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import json
+import functools
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -9,10 +10,19 @@ from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.runnables import RunnableLambda
 from pydantic import BaseModel, Field
 
-from src.config import llm_client
+from src.config import llm_client, model_settings
 from src.pipeline.base import Node, PipelineContext
 
-from .utils import coerce_str, extract_json, load_video_base64
+from .utils import (
+    ainvoke_with_cache,
+    coerce_int,
+    coerce_str,
+    coerce_str_fields,
+    invoke_with_cache,
+    load_video_part,
+    parse_json,
+    prompt_cache_key,
+)
 
 SYSTEM_PROMPT = (
     "You are a UX analyst extracting the exact sequence of screens shown in a demo "
@@ -40,6 +50,9 @@ class ScreenExtractionResult(BaseModel):
     screens: list[ScreenInfo] = Field(default_factory=list)
 
 
+_SCREEN_KEYS = ("name", "description", "start_timestamp", "end_timestamp")
+
+
 class ScreenParser(BaseOutputParser[ScreenExtractionResult]):
     def get_format_instructions(self) -> str:
         return (
@@ -49,91 +62,79 @@ class ScreenParser(BaseOutputParser[ScreenExtractionResult]):
         )
 
     def parse(self, text: str) -> ScreenExtractionResult:
-        payload = json.loads(extract_json(text))
+        payload = parse_json(text)
         screens_payload = payload.get("screens") or []
         screens: list[ScreenInfo] = []
         if isinstance(screens_payload, list):
-            for index, item in enumerate(screens_payload):
-                if not isinstance(item, dict):
-                    continue
-                screens.append(
-                    ScreenInfo(
-                        order=_coerce_int(item.get("order"), index + 1),
-                        name=coerce_str(item.get("name")),
-                        description=coerce_str(item.get("description")),
-                        start_timestamp=coerce_str(item.get("start_timestamp")),
-                        end_timestamp=coerce_str(item.get("end_timestamp")),
-                        key_elements=_coerce_str_list(item.get("key_elements")),
-                    )
+            screens = [
+                ScreenInfo.model_construct(
+                    order=coerce_int(item.get("order"), index + 1),
+                    key_elements=_coerce_str_list(item.get("key_elements")),
+                    **coerce_str_fields(item, _SCREEN_KEYS),
                 )
+                for index, item in enumerate(screens_payload)
+                if isinstance(item, dict)
+            ]
 
-        return ScreenExtractionResult(screens=screens)
+        return ScreenExtractionResult.model_construct(screens=screens)
+
+
+_PARSER = ScreenParser()
+_SYSTEM_TEXT = SYSTEM_PROMPT.format(format_instructions=_PARSER.get_format_instructions())
+_HUMAN_TEXT_PART = {"type": "text", "text": HUMAN_PROMPT}
+_CACHE_KEY = prompt_cache_key(
+    model_settings("SCREEN_EXTRACTOR_MODEL"), _SYSTEM_TEXT, HUMAN_PROMPT
+)
+_CACHE_NAMESPACE = "screens"
 
 
 class ScreenExtractor:
     def __init__(self) -> None:
-        self.parser = ScreenParser()
-        self.model = llm_client.SCREEN_EXTRACTOR_MODEL
-        self.chain = self._build_chain()
+        self.parser = _PARSER
+
+    @property
+    def chain(self) -> Any:
+        return _build_chain()
 
     def extract(self, video_path: str | Path) -> ScreenExtractionResult:
-        return self.chain.invoke({"video_path": str(video_path)})
+        return invoke_with_cache(
+            self.chain, video_path, _CACHE_NAMESPACE, _CACHE_KEY, ScreenExtractionResult
+        )
 
     async def aextract(self, video_path: str | Path) -> ScreenExtractionResult:
-        return await self.chain.ainvoke({"video_path": str(video_path)})
-
-    def _build_chain(self) -> Any:
-        def build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
-            video_path = inputs["video_path"]
-            mime_type, video_base64 = load_video_base64(video_path)
-            system_text = SYSTEM_PROMPT.format(
-                format_instructions=self.parser.get_format_instructions()
-            )
-
-            return [
-                SystemMessage(content=system_text),
-                HumanMessage(
-                    content=[
-                        {"type": "text", "text": HUMAN_PROMPT},
-                        {
-                            "type": "file",
-                            "source_type": "base64",
-                            "mime_type": mime_type,
-                            "data": video_base64,
-                        },
-                    ]
-                ),
-            ]
-
-        return RunnableLambda(build_messages) | self.model | self.parser
+        return await ainvoke_with_cache(
+            self.chain, video_path, _CACHE_NAMESPACE, _CACHE_KEY, ScreenExtractionResult
+        )
 
 
 class ScreenExtractorInputs(BaseModel):
     video_path: str
 
 
+@dataclass(slots=True)
 class ScreenExtractorNode(Node):
     name: str = "screen_extractor"
-    depends_on: list[str] = ["split_video"]
-    extractor: ScreenExtractor = Field(default_factory=ScreenExtractor)
+    depends_on: list[str] = field(default_factory=list)
+    extractor: ScreenExtractor = field(default_factory=ScreenExtractor)
 
     def run(self, context: PipelineContext) -> ScreenExtractionResult:
-        inputs = ScreenExtractorInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(ScreenExtractorInputs)
         return self.extractor.extract(inputs.video_path)
 
     async def arun(self, context: PipelineContext) -> ScreenExtractionResult:
-        inputs = ScreenExtractorInputs.model_validate(context.inputs)
+        inputs = context.parse_inputs(ScreenExtractorInputs)
         return await self.extractor.aextract(inputs.video_path)
 
 
-def _coerce_int(value: Any, default: int) -> int:
-    if isinstance(value, int):
-        return value
-    if isinstance(value, str):
-        stripped = value.strip()
-        if stripped.isdigit():
-            return int(stripped)
-    return default
+@functools.cache
+def _build_chain() -> Any:
+    def build_messages(inputs: dict[str, str]) -> list[SystemMessage | HumanMessage]:
+        return [
+            SystemMessage(content=_SYSTEM_TEXT),
+            HumanMessage(content=[_HUMAN_TEXT_PART, load_video_part(inputs["video_path"])]),
+        ]
+
+    return RunnableLambda(build_messages) | llm_client.SCREEN_EXTRACTOR_MODEL | _PARSER
 
 
 def _coerce_str_list(value: Any) -> list[str]:
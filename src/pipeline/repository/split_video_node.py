@@ -1,101 +1,119 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import os
 import re
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from src.pipeline.base import Node, PipelineContext
-from src.utils.ffmpeg import is_available
+from src.utils.ffmpeg import ffmpeg_binary, is_available
 
 
 CLIPS_DIR = Path("data/clips")
 CLIPS_DIR.mkdir(parents=True, exist_ok=True)
 
+_HMS_PATTERN = re.compile(r"^\d{1,2}:\d{2}:\d{2}$")
+_MS_PATTERN = re.compile(r"^\d{1,2}:\d{2}$")
+_SLUG_PATTERN = re.compile(r"[^a-zA-Z0-9]+")
+
 
 class SplitVideoInputs(BaseModel):
     video_path: str
 
 
+@dataclass(slots=True)
 class SplitVideoNode(Node):
     name: str = "split_video"
-    depends_on: list[str] = ["feature_extractor"]
+    depends_on: list[str] = field(default_factory=lambda: ["feature_extractor"])
+    write_clips: bool = False
 
     def run(self, context: PipelineContext) -> dict[str, Any]:
-        if not is_available():
-            raise RuntimeError("ffmpeg is not available in PATH.")
-
-        inputs = SplitVideoInputs.model_validate(context.inputs)
-        feature_payload = context.get_artifact("feature_extractor")
-
-        video_path = Path(inputs.video_path)
-        if not video_path.exists():
-            raise FileNotFoundError(f"Video file not found: {video_path}")
-
-        
-
-        clips: list[dict[str, Any]] = []
-        skipped: list[dict[str, Any]] = []
+        video_path, clips, skipped = _plan_clips(context)
         errors: list[dict[str, Any]] = []
-
-        for index, feature in enumerate(_iter_features(feature_payload)):
-            name = _get_feature_field(feature, "name") or f"feature_{index + 1}"
-            feature_id = _get_feature_field(feature, "id") or _slugify(name)
-            start = _get_feature_field(feature, "start_timestamp")
-            end = _get_feature_field(feature, "end_timestamp")
-
-            start_ts = _normalize_timestamp(start)
-            end_ts = _normalize_timestamp(end)
-
-            if not start_ts or not end_ts:
-                skipped.append(
-                    {
-                        "feature_id": feature_id,
-                        "feature_name": name,
-                        "start_timestamp": start or "",
-                        "end_timestamp": end or "",
-                        "reason": "missing timestamps",
-                    }
-                )
-                continue
-
-            file_name = f"{index + 1:02d}_{_slugify(name)}.mp4"
-            output_path = CLIPS_DIR / file_name
-
-            try:
-                # _run_ffmpeg(video_path, start_ts, end_ts, output_path)
-                clips.append(
-                    {
-                        "feature_id": feature_id,
-                        "feature_name": name,
-                        "start_timestamp": start_ts,
-                        "end_timestamp": end_ts,
-                        "clip_path": str(output_path),
-                    }
-                )
-            except subprocess.CalledProcessError as exc:
-                errors.append(
-                    {
-                        "feature_id": feature_id,
-                        "feature_name": name,
-                        "start_timestamp": start_ts,
-                        "end_timestamp": end_ts,
-                        "error": exc.stderr.strip() if exc.stderr else str(exc),
-                    }
-                )
-
-        return {
-            "clips": clips,
-            "skipped": skipped,
-            "errors": errors,
-            "clips_dir": str(CLIPS_DIR),
-        }
+        if self.write_clips and clips:
+            clips, errors = _cut_clips(video_path, clips)
+        return _split_result(clips, skipped, errors)
 
     async def arun(self, context: PipelineContext) -> dict[str, Any]:
-        return await asyncio.to_thread(self.run, context)
+        video_path, clips, skipped = await asyncio.to_thread(_plan_clips, context)
+        errors: list[dict[str, Any]] = []
+        if self.write_clips and clips:
+            clips, errors = await _acut_clips(video_path, clips)
+        return _split_result(clips, skipped, errors)
+
+
+def _plan_clips(
+    context: PipelineContext,
+) -> tuple[Path, list[dict[str, Any]], list[dict[str, Any]]]:
+    if not is_available():
+        raise RuntimeError("ffmpeg is not available in PATH.")
+
+    inputs = context.parse_inputs(SplitVideoInputs)
+    feature_payload = context.get_artifact("feature_extractor")
+
+    video_path = Path(inputs.video_path)
+    if not video_path.exists():
+        raise FileNotFoundError(f"Video file not found: {video_path}")
+
+    clips: list[dict[str, Any]] = []
+    skipped: list[dict[str, Any]] = []
+
+    for index, feature in enumerate(_iter_features(feature_payload)):
+        name = _get_feature_field(feature, "name") or f"feature_{index + 1}"
+        feature_id = _get_feature_field(feature, "id") or _slugify(name)
+        start = _get_feature_field(feature, "start_timestamp")
+        end = _get_feature_field(feature, "end_timestamp")
+
+        start_ts = _normalize_timestamp(start)
+        end_ts = _normalize_timestamp(end)
+
+        if not start_ts or not end_ts:
+            skipped.append(
+                {
+                    "feature_id": feature_id,
+                    "feature_name": name,
+                    "start_timestamp": start or "",
+                    "end_timestamp": end or "",
+                    "reason": "missing timestamps",
+                }
+            )
+            continue
+
+        file_name = f"{index + 1:02d}_{_slugify(name)}.mp4"
+        output_path = CLIPS_DIR / file_name
+
+        clips.append(
+            {
+                "feature_id": feature_id,
+                "feature_name": name,
+                "start_timestamp": start_ts,
+                "end_timestamp": end_ts,
+                "clip_path": str(output_path),
+            }
+        )
+
+    return video_path, clips, skipped
+
+
+def _split_result(
+    clips: list[dict[str, Any]],
+    skipped: list[dict[str, Any]],
+    errors: list[dict[str, Any]],
+) -> dict[str, Any]:
+    return {
+        "clips": clips,
+        "skipped": skipped,
+        "errors": errors,
+        "clips_dir": str(CLIPS_DIR),
+    }
 
 
 def _iter_features(payload: Any) -> list[Any]:
@@ -120,14 +138,122 @@ def _get_feature_field(feature: Any, field_name: str) -> str:
     return ""
 
 
+def _cut_clips(
+    video_path: Path, clips: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    unique, duplicates = _dedupe_clips(clips)
+    groups = _group_clips(unique)
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        failures = _merge_failures(
+            executor.map(functools.partial(_cut_clip_group, video_path), groups)
+        )
+    _copy_duplicate_clips(duplicates, failures)
+    return _collect_clip_results(clips, failures)
+
+
+async def _acut_clips(
+    video_path: Path, clips: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    unique, duplicates = _dedupe_clips(clips)
+    group_failures = await asyncio.gather(
+        *(asyncio.to_thread(_cut_clip_group, video_path, group) for group in _group_clips(unique))
+    )
+    failures = _merge_failures(group_failures)
+    await asyncio.to_thread(_copy_duplicate_clips, duplicates, failures)
+    return _collect_clip_results(clips, failures)
+
+
+def _dedupe_clips(
+    clips: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[tuple[dict[str, Any], dict[str, Any]]]]:
+    sources: dict[tuple[str, str], dict[str, Any]] = {}
+    duplicates: list[tuple[dict[str, Any], dict[str, Any]]] = []
+    for clip in clips:
+        source = sources.setdefault((clip["start_timestamp"], clip["end_timestamp"]), clip)
+        if source is not clip:
+            duplicates.append((clip, source))
+    return list(sources.values()), duplicates
+
+
+def _group_clips(clips: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    max_workers = min(len(clips), os.cpu_count() or 4)
+    group_size = -(-len(clips) // max_workers)
+    return [clips[start : start + group_size] for start in range(0, len(clips), group_size)]
+
+
+def _merge_failures(group_failures: Iterable[dict[str, str]]) -> dict[str, str]:
+    return {path: error for group in group_failures for path, error in group.items()}
+
+
+def _copy_duplicate_clips(
+    duplicates: list[tuple[dict[str, Any], dict[str, Any]]], failures: dict[str, str]
+) -> None:
+    for clip, source in duplicates:
+        source_error = failures.get(source["clip_path"])
+        if source_error is not None:
+            failures[clip["clip_path"]] = source_error
+            continue
+        try:
+            _link_clip(Path(source["clip_path"]), Path(clip["clip_path"]))
+        except OSError as exc:
+            failures[clip["clip_path"]] = str(exc)
+
+
+def _link_clip(source: Path, target: Path) -> None:
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _collect_clip_results(
+    clips: list[dict[str, Any]], failures: dict[str, str]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    written = [clip for clip in clips if clip["clip_path"] not in failures]
+    errors = [
+        {
+            "feature_id": clip["feature_id"],
+            "feature_name": clip["feature_name"],
+            "start_timestamp": clip["start_timestamp"],
+            "end_timestamp": clip["end_timestamp"],
+            "error": failures[clip["clip_path"]],
+        }
+        for clip in clips
+        if clip["clip_path"] in failures
+    ]
+    return written, errors
+
+
+def _cut_clip_group(video_path: Path, group: list[dict[str, Any]]) -> dict[str, str]:
+    segments = [
+        (clip["start_timestamp"], clip["end_timestamp"], Path(clip["clip_path"])) for clip in group
+    ]
+    try:
+        _run_ffmpeg(video_path, segments)
+        return {}
+    except subprocess.CalledProcessError as exc:
+        if len(segments) == 1:
+            return {str(segments[0][2]): _ffmpeg_error(exc)}
+
+    # Re-run clip by clip so one bad segment does not fail the whole group.
+    failures: dict[str, str] = {}
+    for segment in segments:
+        try:
+            _run_ffmpeg(video_path, [segment])
+        except subprocess.CalledProcessError as exc:
+            failures[str(segment[2])] = _ffmpeg_error(exc)
+    return failures
+
+
 def _normalize_timestamp(value: str) -> str:
     if not value:
         return ""
     if value.isdigit():
         return _seconds_to_timestamp(int(value))
-    if re.match(r"^\d{1,2}:\d{2}:\d{2}$", value):
+    if _HMS_PATTERN.match(value):
         return value
-    if re.match(r"^\d{1,2}:\d{2}$", value):
+    if _MS_PATTERN.match(value):
         return f"00:{value}"
     return ""
 
@@ -139,24 +265,18 @@ def _seconds_to_timestamp(seconds: int) -> str:
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
 
-def _run_ffmpeg(input_path: Path, start: str, end: str, output_path: Path) -> None:
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        str(input_path),
-        "-ss",
-        start,
-        "-to",
-        end,
-        "-c",
-        "copy",
-        str(output_path),
-    ]
-    subprocess.run(cmd, check=True, capture_output=True, text=True)
+def _run_ffmpeg(input_path: Path, segments: list[tuple[str, str, Path]]) -> None:
+    cmd = [ffmpeg_binary() or "ffmpeg", "-y", "-threads", "1", "-i", str(input_path)]
+    for start, end, output_path in segments:
+        cmd.extend(["-ss", start, "-to", end, "-c", "copy", str(output_path)])
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def _ffmpeg_error(exc: subprocess.CalledProcessError) -> str:
+    return exc.stderr.decode("utf-8", "replace").strip() if exc.stderr else str(exc)
 
 
 def _slugify(value: str) -> str:
-    cleaned = re.sub(r"[^a-zA-Z0-9]+", "_", value.strip().lower())
+    cleaned = _SLUG_PATTERN.sub("_", value.strip().lower())
     cleaned = cleaned.strip("_")
     return cleaned or "clip"
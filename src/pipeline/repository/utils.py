@@ -1,9 +1,41 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import functools
+import hashlib
+import logging
 import mimetypes
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
+
+import orjson
+from pydantic import BaseModel
+
+from src.utils.json_io import write_json
+
+VIDEO_CACHE_SIZE = 4
+RESPONSE_CACHE_DIR = Path("data/cache")
+RESPONSE_CACHE_ENV = "DISABLE_RESPONSE_CACHE"
+UPLOAD_POLL_INTERVAL = 2.0
+UPLOAD_TIMEOUT = 600.0
+# The Files API deletes uploads after 48 hours; re-upload a little before that.
+UPLOAD_TTL = 46 * 60 * 60.0
+UPLOAD_RETRY_INTERVAL = 60.0
+
+_FENCE = "```"
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+_uploaded_videos: dict[str, tuple[float, tuple[str, str]]] = {}
+_failed_uploads: dict[str, tuple[float, Exception]] = {}
+_upload_locks: dict[str, threading.Lock] = {}
+_upload_locks_guard = threading.Lock()
 
 
 def guess_video_mime_type(video_path: str) -> str:
@@ -15,27 +47,193 @@ def load_video_base64(video_path: str | Path) -> tuple[str, str]:
     path = Path(video_path)
     if not path.exists():
         raise FileNotFoundError(f"Video file not found: {path}")
-    mime_type = guess_video_mime_type(str(path))
-    video_base64 = base64.b64encode(path.read_bytes()).decode("utf-8")
-    return mime_type, video_base64
+    return guess_video_mime_type(str(path)), _encode_file_base64(path)
+
+
+def load_video_part(video_path: str | Path) -> dict[str, Any]:
+    try:
+        mime_type, file_uri = upload_video(video_path)
+    except FileNotFoundError:
+        raise
+    except Exception as exc:
+        logger.warning("Sending inline base64 for %s: %s", video_path, exc)
+        mime_type, video_base64 = load_video_base64(video_path)
+        return {
+            "type": "file",
+            "source_type": "base64",
+            "mime_type": mime_type,
+            "data": video_base64,
+        }
+    return {"type": "media", "file_uri": file_uri, "mime_type": mime_type}
+
+
+def upload_video(video_path: str | Path) -> tuple[str, str]:
+    path = Path(video_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Video file not found: {path}")
+    stat = path.stat()
+    digest = _file_sha256_cached(path.resolve(), stat.st_mtime_ns, stat.st_size)
+    # Extractors build their messages concurrently; upload each video only once
+    # and let the others fall back straight away if that upload failed.
+    with _upload_lock_for(digest):
+        now = time.monotonic()
+        cached = _uploaded_videos.get(digest)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        failure = _failed_uploads.get(digest)
+        if failure is not None and failure[0] > now:
+            raise RuntimeError(f"Video upload failed recently: {path}") from failure[1]
+        try:
+            uploaded = _upload_video(path)
+        except Exception as exc:
+            logger.warning("Video upload failed: %s", path, exc_info=True)
+            _failed_uploads[digest] = (time.monotonic() + UPLOAD_RETRY_INTERVAL, exc)
+            raise
+        _failed_uploads.pop(digest, None)
+        _uploaded_videos[digest] = (time.monotonic() + UPLOAD_TTL, uploaded)
+    return uploaded
+
+
+def prompt_cache_key(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def response_cache_enabled() -> bool:
+    return os.environ.get(RESPONSE_CACHE_ENV, "").strip().lower() not in {"1", "true", "yes"}
+
+
+def invoke_with_cache(
+    chain: Any, video_path: str | Path, namespace: str, prompt_key: str, schema: type[ModelT]
+) -> ModelT:
+    if not response_cache_enabled():
+        return chain.invoke({"video_path": str(video_path)})
+    cache_path = _response_cache_path(namespace, video_path, prompt_key)
+    cached = _read_cached_response(cache_path, schema)
+    if cached is not None:
+        return cached
+    result = chain.invoke({"video_path": str(video_path)})
+    _write_cached_response(cache_path, result)
+    return result
+
+
+async def ainvoke_with_cache(
+    chain: Any, video_path: str | Path, namespace: str, prompt_key: str, schema: type[ModelT]
+) -> ModelT:
+    if not response_cache_enabled():
+        return await chain.ainvoke({"video_path": str(video_path)})
+    cache_path = await asyncio.to_thread(_response_cache_path, namespace, video_path, prompt_key)
+    cached = await asyncio.to_thread(_read_cached_response, cache_path, schema)
+    if cached is not None:
+        return cached
+    result = await chain.ainvoke({"video_path": str(video_path)})
+    await asyncio.to_thread(_write_cached_response, cache_path, result)
+    return result
 
 
 def extract_json(text: str) -> str:
     cleaned = text.strip()
-    if cleaned.startswith("```"):
-        fence = "```"
-        start = cleaned.find(fence)
-        end = cleaned.rfind(fence)
-        if end > start:
-            block = cleaned[start + len(fence) : end]
-            block = block.lstrip()
+    if cleaned.startswith(_FENCE):
+        end = len(cleaned) - len(_FENCE) if cleaned.endswith(_FENCE) else cleaned.rfind(_FENCE)
+        if end > 0:
+            block = cleaned[len(_FENCE) : end].lstrip()
             if block.startswith("json"):
                 block = block[len("json") :]
             return block.strip()
     return cleaned
 
 
+def parse_json(text: str) -> Any:
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return orjson.loads(extract_json(text))
+
+
+def coerce_int(value: Any, default: int) -> int:
+    if type(value) is int:
+        return value
+    if isinstance(value, str):
+        stripped = value.strip()
+        if stripped.isdigit():
+            return int(stripped)
+    return default
+
+
 def coerce_str(value: Any) -> str:
+    if type(value) is str:
+        return value
     if value is None:
         return ""
     return str(value)
+
+
+def coerce_str_fields(item: dict[str, Any], keys: tuple[str, ...]) -> dict[str, Any]:
+    # Typed as model_construct kwargs: a dict[str, str] would also match `_fields_set`.
+    return {key: coerce_str(item.get(key)) for key in keys}
+
+
+def _response_cache_path(namespace: str, video_path: str | Path, prompt_key: str) -> Path:
+    path = Path(video_path)
+    stat = path.stat()
+    digest = _file_sha256_cached(path.resolve(), stat.st_mtime_ns, stat.st_size)
+    return RESPONSE_CACHE_DIR / namespace / f"{digest}_{prompt_key}.json"
+
+
+def _read_cached_response(path: Path, schema: type[ModelT]) -> ModelT | None:
+    try:
+        return schema.model_validate_json(path.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+    except OSError as exc:
+        logger.warning("Could not read cached response %s: %s", path, exc)
+        return None
+
+
+def _write_cached_response(path: Path, result: BaseModel) -> None:
+    # The response is already paid for; a cache write failure must not lose it.
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(path, result.model_dump(mode="json"))
+    except OSError as exc:
+        logger.warning("Could not write cached response %s: %s", path, exc)
+
+
+@functools.lru_cache(maxsize=VIDEO_CACHE_SIZE)
+def _file_sha256_cached(path: Path, mtime_ns: int, size: int) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def _upload_lock_for(digest: str) -> threading.Lock:
+    with _upload_locks_guard:
+        lock = _upload_locks.get(digest)
+        if lock is None:
+            lock = _upload_locks[digest] = threading.Lock()
+    return lock
+
+
+def _upload_video(path: Path) -> tuple[str, str]:
+    from google import genai
+
+    client = genai.Client()
+    mime_type = guess_video_mime_type(str(path))
+    uploaded = client.files.upload(file=path, config={"mime_type": mime_type})
+    deadline = time.monotonic() + UPLOAD_TIMEOUT
+    while uploaded.state is not None and uploaded.state.name == "PROCESSING":
+        if uploaded.name is None:
+            raise RuntimeError(f"Uploaded video has no file name to poll: {path}")
+        if time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"Uploaded video still processing after {UPLOAD_TIMEOUT:.0f}s: {path}"
+            )
+        time.sleep(UPLOAD_POLL_INTERVAL)
+        uploaded = client.files.get(name=uploaded.name)
+    if uploaded.state is not None and uploaded.state.name == "FAILED":
+        raise RuntimeError(f"Uploaded video failed processing: {path}")
+    if uploaded.uri is None:
+        raise RuntimeError(f"Uploaded video has no file URI: {path}")
+    return mime_type, uploaded.uri
+
+
+def _encode_file_base64(path: Path) -> str:
+    return base64.b64encode(path.read_bytes()).decode("ascii")
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import argparse
-import json
 import logging
 from typing import Any
 
+import orjson
 
 import src.config
 from src.config.logging import LOGGING_CONFIG
@@ -84,7 +84,10 @@ def main() -> None:
 
     context = run_pipeline(_load_inputs(args), args.pipeline_type)
 
-    print(json.dumps(context.to_jsonable(), indent=2))
+    output = orjson.dumps(
+        context.to_jsonable(), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    )
+    print(output.decode())
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import deque
 from typing import Annotated, Awaitable, Callable, TypedDict
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -77,10 +78,13 @@ class Pipeline(BaseModel):
             if not node.depends_on:
                 graph.add_edge(START, node.name)
 
-            for dep in node.depends_on:
-                if dep in conditional_nodes:
-                    continue
-                graph.add_edge(dep, node.name)
+            direct_deps = [dep for dep in node.depends_on if dep not in conditional_nodes]
+            if len(direct_deps) == 1:
+                graph.add_edge(direct_deps[0], node.name)
+            elif direct_deps:
+                # Join edge: wait for every parent, then run once.
+                graph.add_edge(direct_deps, node.name)
+            for dep in direct_deps:
                 dependents[dep].add(node.name)
 
         for name, node in conditional_nodes.items():
@@ -118,11 +122,11 @@ class Pipeline(BaseModel):
                 indegree[node.name] += 1
                 dependents[dep].append(node.name)
 
-        queue = [name for name, degree in indegree.items() if degree == 0]
+        queue = deque(name for name, degree in indegree.items() if degree == 0)
         order_names: list[str] = []
 
         while queue:
-            name = queue.pop(0)
+            name = queue.popleft()
             order_names.append(name)
             for child in dependents[name]:
                 indegree[child] -= 1
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import functools
 import shutil
 
 
+@functools.cache
+def ffmpeg_binary() -> str | None:
+    return shutil.which("ffmpeg")
+
+
 def is_available() -> bool:
-    return shutil.which("ffmpeg") is not None
+    return ffmpeg_binary() is not None
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from typing import Any
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_SUFFIXES = ("ments", "ment", "ings", "ing", "ions", "ion", "ed", "s")
+_MIN_STEM_LENGTH = 3
+_STOPWORDS = frozenset(
+    {
+        "a", "about", "after", "all", "an", "and", "any", "are", "as", "at", "be",
+        "before", "by", "can", "do", "does", "for", "from", "how", "i", "if", "in",
+        "into", "is", "it", "its", "me", "my", "new", "of", "on", "or", "our", "so",
+        "some", "that", "the", "their", "then", "there", "these", "this", "to", "up",
+        "use", "using", "want", "was", "we", "what", "when", "where", "which", "while",
+        "who", "will", "with", "you", "your",
+    }
+)
+
+
+def terms(text: str, stopwords: frozenset[str] = frozenset()) -> set[str]:
+    return {
+        _stem(token)
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in _STOPWORDS and token not in stopwords
+    }
+
+
+def rank_candidates(
+    query: str,
+    candidates: list[dict[str, Any]],
+    limit: int,
+    stopwords: frozenset[str] = frozenset(),
+) -> list[dict[str, Any]]:
+    query_terms = terms(query, stopwords)
+    if not query_terms:
+        return candidates[:limit]
+    matched = [query_terms & _candidate_terms(candidate) for candidate in candidates]
+    total = len(candidates)
+    # BM25 idf: terms shared by most candidates carry almost no weight.
+    weights = {
+        term: math.log(1 + (total - count + 0.5) / (count + 0.5))
+        for term, count in Counter(term for found in matched for term in found).items()
+    }
+    scores = [sum(weights[term] for term in found) for found in matched]
+    ranked = sorted(range(total), key=lambda index: -scores[index])[:limit]
+    return [candidates[index] for index in sorted(ranked)]
+
+
+def _candidate_terms(candidate: dict[str, Any]) -> set[str]:
+    found: set[str] = set()
+    for value in candidate.values():
+        if isinstance(value, str):
+            found |= terms(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, str):
+                    found |= terms(item)
+    return found
+
+
+def _stem(token: str) -> str:
+    for suffix in _SUFFIXES:
+        if suffix == "s" and token.endswith("ss"):
+            continue
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM_LENGTH:
+            token = token[: -len(suffix)]
+            break
+    if token.endswith("e") and len(token) > _MIN_STEM_LENGTH:
+        token = token[:-1]
+    return token
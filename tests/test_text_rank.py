@@ -0,0 +1,44 @@
+from src.utils.text_rank import rank_candidates, terms
+
+QUERY = "add a feature of attaching a file to the email before sending"
+QUERY_STOPWORDS = frozenset({"add", "app", "feature", "features"})
+
+
+def _filler(count: int) -> list[dict[str, object]]:
+    return [
+        {
+            "name": f"Inbox feature {index}",
+            "description": "A feature to move the email to a folder and sort it by date",
+            "steps": ["Open the inbox", "Select an email"],
+        }
+        for index in range(count)
+    ]
+
+
+def test_rank_candidates_keeps_the_only_real_match() -> None:
+    attachment = {
+        "name": "File attachment",
+        "description": "Attach documents to an outgoing message",
+    }
+    candidates = [*_filler(30), attachment, *_filler(30)]
+
+    for stopwords in (frozenset(), QUERY_STOPWORDS):
+        ranked = rank_candidates(QUERY, candidates, limit=40, stopwords=stopwords)
+
+        assert len(ranked) == 40
+        assert attachment in ranked
+
+
+def test_rank_candidates_preserves_input_order() -> None:
+    candidates = [{"name": "Send"}, {"name": "Inbox"}, {"name": "File attachment"}]
+
+    ranked = rank_candidates(QUERY, candidates, limit=2)
+
+    assert ranked == [candidates[0], candidates[2]]
+
+
+def test_terms_drop_stopwords_and_share_stems() -> None:
+    assert terms("the attachment") == terms("attaching") == {"attach"}
+    assert terms("files") == terms("file")
+    assert terms("a feature of the") == {"featur"}
+    assert terms("a feature of the", QUERY_STOPWORDS) == set()